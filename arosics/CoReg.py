@@ -23,15 +23,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import os
+import threading
 import time
 import warnings
+from collections import OrderedDict
 from copy import copy
+from functools import lru_cache
 from typing import Iterable, Union, Tuple, List, Optional  # noqa F401
 
 # custom
 from osgeo import gdal
 import numpy as np
+from scipy.fft import rfft2, irfft2
 
 from packaging.version import parse as parse_version
 try:
@@ -42,6 +47,7 @@ try:
 except ImportError:
     pyfftw = None
 from shapely.geometry import Point, Polygon
+from shapely.wkb import loads as load_wkb
 
 # internal modules
 from .DeShifter import DESHIFTER, _dict_rspAlg_rsp_Int
@@ -62,6 +68,227 @@ from py_tools_ds.io.vector.writer import write_shp
 
 __author__ = 'Daniel Scheffler'
 
+# maps all supported resampling algorithm keys (names and GDAL integer codes) to the algorithm name
+_rspAlg_names = {k: k if isinstance(k, str) else v for k, v in _dict_rspAlg_rsp_Int.items()}
+
+_fftw_plans = threading.local()  # per-thread LRU caches of pyFFTW plans (released when the thread exits)
+_fftw_plans_maxsize = 8  # maximum number of cached pyFFTW plans per thread
+
+
+@lru_cache(maxsize=None)
+def _get_gdal_driver(fmt: str) -> Optional[gdal.Driver]:
+    """Return the GDAL driver for the given format name or None if the format is not supported.
+
+    NOTE: The lookup is cached since COREG is instanced very often, e.g., by Tie_Point_Grid.
+
+    :param fmt: GDAL short format name, e.g., 'ENVI' or 'GTiff'
+    """
+    gdal.AllRegister()  # only called once per format name due to the cache
+
+    return gdal.GetDriverByName(fmt)
+
+
+@lru_cache(maxsize=None)
+def _get_file_extension(fmt: str) -> str:
+    """Return the default file extension for the given GDAL format name (without leading dot, '' if there is none).
+
+    :param fmt: GDAL short format name, e.g., 'ENVI' or 'GTiff'
+    """
+    if fmt == 'ENVI':
+        return 'bsq'
+
+    return _get_gdal_driver(fmt).GetMetadataItem(gdal.DMD_EXTENSION) or ''
+
+
+@lru_cache(maxsize=32)
+def _prj_equal(prj1: Union[str, int], prj2: Union[str, int]) -> bool:
+    """Return True if the two given projections are equal (cached version of py_tools_ds' prj_equal()).
+
+    NOTE: Each call of prj_equal() parses the given projections. Since all COREG instances of a tie point grid compare
+          the same projections, the result is cached.
+    """
+    return prj_equal(prj1, prj2)
+
+
+@lru_cache(maxsize=32)
+def _geotransform2mapinfo_cached(gt: tuple, prj: str) -> tuple:
+    """Return the output of py_tools_ds' geotransform2mapinfo() as tuple (cached, use _get_mapinfo() to call it)."""
+    return tuple(geotransform2mapinfo(list(gt), prj))
+
+
+def _get_mapinfo(gt: Union[list, tuple], prj: str) -> list:
+    """Return the ENVI map info for the given GDAL geotransform and projection (cached version of py_tools_ds'
+    geotransform2mapinfo()).
+
+    NOTE: Within a tie point grid, each COREG instance converts the same geotransforms. A new list is returned on
+          each call, so it may be modified by the caller.
+    """
+    return list(_geotransform2mapinfo_cached(tuple(gt), prj))
+
+
+@lru_cache(maxsize=32)
+def _get_overlap_polygon_cached(poly1_wkb: bytes, poly2_wkb: bytes) -> dict:
+    """Return the output of py_tools_ds' get_overlap_polygon() for two polygons given as WKB.
+
+    NOTE: Tie_Point_Grid creates one COREG instance per tie point, all with the same footprint polygons. The cache
+          avoids that the overlap is recomputed each time. The returned dictionary must not be modified.
+
+    :param poly1_wkb:   first polygon as WKB
+    :param poly2_wkb:   second polygon as WKB
+    :return:            dictionary with the keys 'overlap poly', 'overlap percentage' and 'overlap area'
+    """
+    with warnings.catch_warnings():
+        # already warned in GeoArray_CoReg.__init__()
+        warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*disjunct.*")
+
+        return get_overlap_polygon(load_wkb(poly1_wkb), load_wkb(poly2_wkb))
+
+
+@lru_cache(maxsize=None)
+def _get_plotly_offline():
+    """Import plotly's offline plotting interface and initialize the notebook mode (only done once per session).
+
+    :return:    plotly.offline.iplot, plotly.graph_objs
+    """
+    from plotly.offline import iplot, init_notebook_mode
+    import plotly.graph_objs as go
+
+    init_notebook_mode(connected=True)
+
+    return iplot, go
+
+
+@lru_cache(maxsize=None)
+def _get_holoviews():
+    """Import holoviews and load its matplotlib notebook extension (only done once per session).
+
+    :return:    holoviews module
+    """
+    try:
+        import holoviews as hv
+    except ImportError:
+        raise ImportError(
+            "This method requires the library 'holoviews'. It can be installed for Anaconda with "
+            "the shell command 'conda install -c conda-forge holoviews bokeh'.")
+
+    hv.notebook_extension('matplotlib')
+    hv.Store.add_style_opts(hv.Image, ['vmin', 'vmax'])
+
+    return hv
+
+
+def _rescale_to_int8(arr: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+    """Rescale the given array from (vmin, vmax) to the int8 value range.
+
+    This is the same as skimage.exposure.rescale_intensity(arr, in_range=(vmin, vmax), out_range='int8'), i.e.,
+    non-negative input ranges are mapped to [0, 127] and signed ones to [-128, 127]. The scaling is done in place
+    within a single float64 array instead of creating multiple temporaries.
+
+    :param arr:     input array
+    :param vmin:    lower bound of the input value range
+    :param vmax:    upper bound of the input value range
+    :return:        rescaled int8 array
+    """
+    omin = 0 if vmin >= 0 else -128
+    arr_scaled = np.clip(arr, vmin, vmax, dtype=np.float64, casting='unsafe')
+
+    if vmax != vmin:
+        arr_scaled -= vmin
+        arr_scaled /= vmax - vmin
+        arr_scaled *= 127 - omin
+        arr_scaled += omin
+    else:
+        np.clip(arr_scaled, omin, 127, out=arr_scaled)
+
+    return arr_scaled.astype(np.int8)
+
+
+def _get_fftw_plan(shape: tuple,
+                   dtype: type = np.float32,
+                   direction: str = 'FFTW_FORWARD',
+                   threads: int = 1):
+    """Return a cached pyFFTW plan of a real-to-complex 2D FFT (or its inverse) on SIMD-aligned in- and output buffers.
+
+    NOTE: The plan is created once per window shape (FFTW_MEASURE planning overwrites the input buffer, which is why
+          the buffers are allocated here and only filled afterwards). The buffers are reused by subsequent calls, so
+          plans are not shared between threads and they should be run via _execute_fftw_plan(). Each thread keeps
+          only the most recently used plans (see _fftw_plans_maxsize) to bound the memory of the cached buffers.
+
+    :param shape:       shape of the real-valued array in the spatial domain
+                        (the complex array in the frequency domain has the shape (rows, cols // 2 + 1); a leading
+                        dimension may be given to transform a batch of arrays)
+    :param dtype:       real-valued data type of the array in the spatial domain
+    :param direction:   'FFTW_FORWARD' (real -> complex) or 'FFTW_BACKWARD' (complex -> real)
+    :param threads:     number of threads to be used by FFTW
+    :return:            pyfftw.FFTW instance
+    """
+    plans = getattr(_fftw_plans, 'plans', None)
+    if plans is None:
+        plans = _fftw_plans.plans = OrderedDict()
+
+    key = (tuple(shape), np.dtype(dtype).str, direction, threads)
+
+    if key in plans:
+        plans.move_to_end(key)
+    else:
+        real_arr = pyfftw.empty_aligned(shape, dtype=dtype)
+        cplx_arr = pyfftw.empty_aligned(shape[:-1] + (shape[-1] // 2 + 1,), dtype=np.result_type(dtype, np.complex64))
+        in_arr, out_arr = (real_arr, cplx_arr) if direction == 'FFTW_FORWARD' else (cplx_arr, real_arr)
+        plans[key] = pyfftw.FFTW(in_arr, out_arr, axes=(-2, -1), direction=direction,
+                                 flags=('FFTW_MEASURE', 'FFTW_DESTROY_INPUT'), threads=threads)
+
+        if len(plans) > _fftw_plans_maxsize:
+            plans.popitem(last=False)  # drop the least recently used plan
+
+    return plans[key]
+
+
+def _execute_fftw_plan(plan, *arrs: np.ndarray, copy_output: bool = True) -> np.ndarray:
+    """Copy the given array(s) into the aligned input buffer of a cached pyFFTW plan, run it and return its output.
+
+    NOTE: By default, the output is copied since the output buffer is overwritten by the next call of the same plan.
+
+    :param plan:        pyfftw.FFTW instance as returned by _get_fftw_plan()
+    :param arrs:        input array (casted to the input data type of the plan) or multiple input arrays to be
+                        transformed in a single batch (copied into the input buffer along its first axis);
+                        if no array is given, the plan is run on the current content of plan.input_array
+    :param copy_output: whether to return a copy of the output buffer (set to False if the result is only used until
+                        the same plan is run again)
+    :return:            (copy of the) normalized transformation result
+    """
+    if len(arrs) == 1:
+        np.copyto(plan.input_array, arrs[0], casting='unsafe')
+    else:
+        for buf, arr in zip(plan.input_array, arrs):
+            np.copyto(buf, arr, casting='unsafe')
+    plan()
+
+    return plan.output_array.copy() if copy_output else plan.output_array
+
+
+def _fftshift_inplace(arr: np.ndarray) -> np.ndarray:
+    """Shift the zero-frequency component of a 2D array to the center (same as np.fft.fftshift).
+
+    For even dimensions, this is done in place by swapping the diagonal quadrants (only one quadrant-sized scratch
+    buffer is needed). Arrays with odd dimensions are passed to np.fft.fftshift.
+
+    :param arr: 2D array to be shifted (modified in place if both dimensions are even)
+    :return:    the shifted array
+    """
+    rows, cols = arr.shape
+    if rows % 2 or cols % 2:
+        return np.fft.fftshift(arr)
+
+    r2, c2 = rows // 2, cols // 2
+    tmp = arr[:r2, :c2].copy()
+    arr[:r2, :c2] = arr[r2:, c2:]
+    arr[r2:, c2:] = tmp
+    tmp[:] = arr[:r2, c2:]
+    arr[:r2, c2:] = arr[r2:, :c2]
+    arr[r2:, :c2] = tmp
+
+    return arr
+
 
 class GeoArray_CoReg(GeoArray):
     def __init__(self,
@@ -111,6 +338,7 @@ class GeoArray_CoReg(GeoArray):
         # set footprint_poly
         given_footprint_poly = CoReg_params['footprint_poly_%s' % ('ref' if imID == 'ref' else 'tgt')]
         given_corner_coord = CoReg_params['data_corners_%s' % ('ref' if imID == 'ref' else 'tgt')]
+        footprint_is_extent = False
 
         if given_footprint_poly:
             self.footprint_poly = given_footprint_poly
@@ -119,6 +347,7 @@ class GeoArray_CoReg(GeoArray):
         elif not CoReg_params['calc_corners']:
             # use the image extent
             self.footprint_poly = Polygon(get_corner_coordinates(gt=self.gt, cols=self.cols, rows=self.rows))
+            footprint_is_extent = True
         else:
             # footprint_poly is calculated automatically by GeoArray
             if not CoReg_params['q']:
@@ -132,8 +361,8 @@ class GeoArray_CoReg(GeoArray):
                               'AROSICS will only process the largest image part.' % self.imName)
                 # FIXME use a convex hull as footprint poly
 
-        # validate footprint poly
-        if not self.footprint_poly.is_valid:
+        # validate footprint poly (not needed for the image extent which is always a valid rectangle)
+        if not footprint_is_extent and not self.footprint_poly.is_valid:
             self.footprint_poly = self.footprint_poly.buffer(0)
 
         if not self.q:
@@ -324,10 +553,10 @@ class COREG(object):
             Useful for batch processing. (default: False)
             In case of error COREG.success == False and COREG.x_shift_px/COREG.y_shift_px is None
         """
-        self.params = dict([x for x in locals().items() if x[0] != "self"])
+        self.params = {k: v for k, v in locals().items() if k != 'self'}
 
         # input validation
-        if gdal.GetDriverByName(fmt_out) is None:
+        if _get_gdal_driver(fmt_out) is None:
             raise ValueError(fmt_out, "'%s' is not a supported GDAL driver." % fmt_out)
 
         if match_gsd and out_gsd:
@@ -338,20 +567,18 @@ class COREG(object):
 
         if data_corners_ref and not isinstance(data_corners_ref[0], list):
             # group if not [[x,y],[x,y]..] but [x,y,x,y,]
-            data_corners_ref = [data_corners_ref[i:i + 2]
-                                for i in range(0, len(data_corners_ref), 2)]
+            self.params['data_corners_ref'] = np.asarray(data_corners_ref).reshape(-1, 2).tolist()
 
         if data_corners_tgt and not isinstance(data_corners_tgt[0], list):
             # group if not [[x,y],[x,y]..]
-            data_corners_tgt = [data_corners_tgt[i:i + 2]
-                                for i in range(0, len(data_corners_tgt), 2)]
+            self.params['data_corners_tgt'] = np.asarray(data_corners_tgt).reshape(-1, 2).tolist()
 
         if nodata and (not isinstance(nodata, Iterable) or len(nodata) != 2):
             raise ValueError(nodata, "'nodata' must be an iterable with two values. "
                                      "Got %s with length %s." % (type(nodata), len(nodata)))
 
         for rspAlg in [resamp_alg_deshift, resamp_alg_calc]:
-            if rspAlg not in _dict_rspAlg_rsp_Int.keys():
+            if rspAlg not in _rspAlg_names:
                 raise ValueError("'%s' is not a supported resampling algorithm." % rspAlg)
 
         if resamp_alg_calc in ['average', 5] and (v or not q):
@@ -370,10 +597,8 @@ class COREG(object):
         self.match_gsd = match_gsd
         self.out_gsd = out_gsd
         self.target_xyGrid = target_xyGrid
-        self.rspAlg_DS = resamp_alg_deshift \
-            if isinstance(resamp_alg_deshift, str) else _dict_rspAlg_rsp_Int[resamp_alg_deshift]
-        self.rspAlg_calc = resamp_alg_calc \
-            if isinstance(resamp_alg_calc, str) else _dict_rspAlg_rsp_Int[resamp_alg_calc]
+        self.rspAlg_DS = _rspAlg_names[resamp_alg_deshift]
+        self.rspAlg_calc = _rspAlg_names[resamp_alg_calc]
         self.calc_corners = calc_corners
         self.CPUs = CPUs
         self.bin_ws = binary_ws
@@ -406,17 +631,18 @@ class COREG(object):
         self.vec_length_map = None
         self.vec_angle_deg = None
         self.updated_map_info = None  # set by self.get_updated_map_info()
-        self.ssim_orig = None  # set by self._validate_ssim_improvement()
-        self.ssim_deshifted = None  # set by self._validate_ssim_improvement()
+        self._ssim_orig = None  # private attribute to be filled by self._validate_ssim_improvement()
+        self._ssim_deshifted = None  # private attribute to be filled by self._validate_ssim_improvement()
         self._ssim_improved = None  # private attribute to be filled by self.ssim_improved
+        self._ssim_pending = False  # set by self.calculate_spatial_shifts() if the SSIM computation is deferred
         self.shift_reliability = None  # set by self.calculate_spatial_shifts()
+        self._deshifted_otherWin = None  # (key, GeoArray) tuple cached by self._get_deshifted_otherWin()
 
         self.tracked_errors = []  # expanded each time an error occurs
         self.success = None  # default
         self.deshift_results = None  # set by self.correct_shifts()
 
         # try:
-        gdal.AllRegister()
         self._check_and_handle_metaRotation()
         self._get_image_params()
         self._set_outpathes(im_ref, im_tgt)
@@ -513,8 +739,7 @@ class COREG(object):
                         dir_out = os.path.dirname(path_im_ref)
 
                 if not fName_out:
-                    ext = 'bsq' if self.fmt_out == 'ENVI' else \
-                        gdal.GetDriverByName(self.fmt_out).GetMetadataItem(gdal.DMD_EXTENSION)
+                    ext = _get_file_extension(self.fmt_out)
                     fName_out = fName_out if fName_out not in ['.', ''] else \
                         '%s__shifted_to__%s' % (get_baseN(path_im_tgt), get_baseN(path_im_ref))
                     fName_out = fName_out + '.%s' % ext if ext else fName_out
@@ -555,7 +780,7 @@ class COREG(object):
         self.ref = GeoArray_CoReg(self.params, 'ref')
         self.shift = GeoArray_CoReg(self.params, 'shift')
 
-        if not prj_equal(self.ref.prj, self.shift.prj):
+        if not _prj_equal(self.ref.prj, self.shift.prj):
             from pyproj import CRS
 
             crs_ref = CRS.from_user_input(self.ref.prj)
@@ -569,11 +794,11 @@ class COREG(object):
                 'Got %s vs. %s.' % (name_ref, name_shift))
 
     def _get_overlap_properties(self) -> None:
-        with warnings.catch_warnings():
-            # already warned in GeoArray_CoReg.__init__()
-            warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*disjunct.*")
+        overlap_tmp = _get_overlap_polygon_cached(self.ref.poly.wkb, self.shift.poly.wkb)
 
-            overlap_tmp = get_overlap_polygon(self.ref.poly, self.shift.poly, self.v)
+        if self.v and overlap_tmp['overlap poly']:
+            print('%.2f percent of the image to be shifted is covered by the reference image.'
+                  % overlap_tmp['overlap percentage'])
 
         self.overlap_poly = overlap_tmp['overlap poly']  # has to be in reference projection
         self.overlap_percentage = overlap_tmp['overlap percentage']
@@ -609,7 +834,7 @@ class COREG(object):
 
     @property
     def are_pixGrids_equal(self):
-        return prj_equal(self.ref.prj, self.shift.prj) and \
+        return _prj_equal(self.ref.prj, self.shift.prj) and \
                is_coord_grid_equal(self.ref.gt, *self.shift.xygrid_specs, tolerance=1e-8)
 
     def equalize_pixGrids(self) -> None:
@@ -686,17 +911,7 @@ class COREG(object):
 
         if interactive:
             # use Holoviews
-            try:
-                import holoviews as hv
-            except ImportError:
-                hv = None
-            if not hv:
-                raise ImportError(
-                    "This method requires the library 'holoviews'. It can be installed for Anaconda with "
-                    "the shell command 'conda install -c conda-forge holoviews bokeh'.")
-
-            hv.notebook_extension('matplotlib')
-            hv.Store.add_style_opts(hv.Image, ['vmin', 'vmax'])
+            hv = _get_holoviews()
 
             # hv.Store.option_setters.options().Image = hv.Options('style', cmap='gnuplot2')
             # hv.Store.add_style_opts(hv.Image, ['cmap'])
@@ -707,12 +922,11 @@ class COREG(object):
             xmin, xmax, ymin, ymax = self.matchBox.boundsMap
 
             def get_hv_image(geoArr):
-                from skimage.exposure import rescale_intensity  # import here to avoid static TLS ImportError
+                arr = geoArr[:]
+                mask_nodata = arr == geoArr.nodata
+                vmin, vmax = np.nanpercentile(arr[~mask_nodata], [pmin, pmax])  # both in a single pass
 
-                arr_masked = np.ma.masked_equal(geoArr[:], geoArr.nodata)
-                vmin = np.nanpercentile(arr_masked.compressed(), pmin)
-                vmax = np.nanpercentile(arr_masked.compressed(), pmax)
-                arr2plot = rescale_intensity(arr_masked, in_range=(vmin, vmax), out_range='int8')
+                arr2plot = np.ma.masked_array(_rescale_to_int8(arr, vmin, vmax), mask=mask_nodata)
 
                 return hv.Image(arr2plot, bounds=(xmin, ymin, xmax, ymax))\
                     .opts(style={'cmap': 'gray',
@@ -774,10 +988,7 @@ class COREG(object):
             # create plotly 3D surface
 
             # import plotly.plotly as py # online mode -> every plot is uploaded into online plotly account
-            from plotly.offline import iplot, init_notebook_mode
-            import plotly.graph_objs as go
-
-            init_notebook_mode(connected=True)
+            iplot, go = _get_plotly_offline()
 
             z_data = self._calc_shifted_cross_power_spectrum()
             data = [go.Surface(z=z_data)]
@@ -809,13 +1020,16 @@ class COREG(object):
             'The window position must be a tuple of two elements. Got %s with %s elements.' % (type(wp), len(wp))
         wp = tuple(wp)
 
+        # buffer the overlap polygon only once (needed for validating the window position)
+        overlap_poly_buffered = self.overlap_poly.buffer(1e-5)
+
         if None in wp:
             # use centroid point if possible
-            overlap_center_pos_x, overlap_center_pos_y = self.overlap_poly.centroid.coords.xy
-            wp = (wp[0] if wp[0] else overlap_center_pos_x[0]), (wp[1] if wp[1] else overlap_center_pos_y[0])
+            overlap_center = self.overlap_poly.centroid
+            wp = (wp[0] if wp[0] else overlap_center.x), (wp[1] if wp[1] else overlap_center.y)
 
             # validate window position
-            if not self.overlap_poly.buffer(1e-5).contains(Point(wp)):
+            if not overlap_poly_buffered.contains(Point(wp)):
                 # in case the centroid point is not within overlap area
                 if not self.q:
                     warnings.warn("The centroid point of the two input images could not be used as matching window "
@@ -824,14 +1038,14 @@ class COREG(object):
                                   "position as input parameter.")
 
                 # -> use representative point: a point that is garanteed to be within overlap polygon
-                overlap_center_pos_x, overlap_center_pos_y = self.overlap_poly.representative_point().coords.xy
-                wp = overlap_center_pos_x[0], overlap_center_pos_y[0]
+                representative_point = self.overlap_poly.representative_point()
+                wp = representative_point.x, representative_point.y
 
-            assert self.overlap_poly.buffer(1e-5).contains(Point(wp))
+            assert overlap_poly_buffered.contains(Point(wp))
 
         else:
             # validate window position
-            if not self.overlap_poly.buffer(1e-5).contains(Point(wp)):
+            if not overlap_poly_buffered.contains(Point(wp)):
                 self._handle_error(ValueError('The provided window position %s/%s is outside of the overlap '
                                               'area of the two input images. Check the coordinates.' % wp))
 
@@ -887,24 +1101,42 @@ class COREG(object):
                    gt=self.ref.gt)
 
         # clip matching window to overlap area
-        matchBox.mapPoly = matchBox.mapPoly.intersection(overlapWin.mapPoly)
-
-        # check if matchBox extent touches no data area of the image -> if yes: shrink it
-        overlapPoly_within_matchWin = matchBox.mapPoly.intersection(self.overlap_poly)
-        if overlapPoly_within_matchWin.area < matchBox.mapPoly.area:
-            wsX_start, wsY_start = \
-                1 if wsX >= wsY else \
-                wsX / wsY, 1 if wsY >= wsX else \
-                wsY / wsX
-            box = boxObj(**dict(wp=(wpX, wpY),
-                                ws=(wsX_start, wsY_start),
-                                gt=matchBox.gt))
-            while True:
-                box.buffer_imXY(1, 1)
-                if not box.mapPoly.within(overlapPoly_within_matchWin):
-                    box.buffer_imXY(-1, -1)
-                    matchBox = box
-                    break
+        # NOTE: This is skipped in the common case that the matching window is completely within the overlap area.
+        #       Then, the intersections below would not change it and no shrinking is needed.
+        if not matchBox.mapPoly.within(overlapWin.mapPoly):
+            matchBox.mapPoly = matchBox.mapPoly.intersection(overlapWin.mapPoly)
+
+            # check if matchBox extent touches no data area of the image -> if yes: shrink it
+            overlapPoly_within_matchWin = matchBox.mapPoly.intersection(self.overlap_poly)
+            if overlapPoly_within_matchWin.area < matchBox.mapPoly.area:
+                wsX_start, wsY_start = \
+                    1 if wsX >= wsY else \
+                    wsX / wsY, 1 if wsY >= wsX else \
+                    wsY / wsX
+
+                def get_buffered_box(buff_px):
+                    box = boxObj(**dict(wp=(wpX, wpY),
+                                        ws=(wsX_start, wsY_start),
+                                        gt=matchBox.gt))
+                    box.buffer_imXY(buff_px, buff_px)
+                    return box
+
+                def is_within(buff_px):
+                    return get_buffered_box(buff_px).mapPoly.within(overlapPoly_within_matchWin)
+
+                # find the largest buffer that keeps the box within the overlap area (the boxes are nested, i.e., the
+                # within-test is monotonic) -> exponential + binary search instead of growing the box pixel by pixel
+                buff_valid, buff_invalid = 0, 1
+                while is_within(buff_invalid):
+                    buff_valid, buff_invalid = buff_invalid, buff_invalid * 2
+                while buff_invalid - buff_valid > 1:
+                    buff_mid = (buff_valid + buff_invalid) // 2
+                    if is_within(buff_mid):
+                        buff_valid = buff_mid
+                    else:
+                        buff_invalid = buff_mid
+
+                matchBox = get_buffered_box(buff_valid)
 
         # move matching window to imref grid or im2shift grid
         mW_rows, mW_cols = \
@@ -1057,7 +1289,7 @@ class COREG(object):
 
         # equalize pixel grids and projection of matchWin and otherWin (ONLY if grids are really different)
         if not (self.matchWin.xygrid_specs == self.otherWin.xygrid_specs and
-                prj_equal(self.matchWin.prj, self.otherWin.prj)):
+                _prj_equal(self.matchWin.prj, self.otherWin.prj)):
             self.otherWin.arr, self.otherWin.gt = warp_ndarray(self.otherWin.arr,
                                                                self.otherWin.gt,
                                                                self.otherWin.prj,
@@ -1096,17 +1328,25 @@ class COREG(object):
         :param win_shape_YX:    source window shape as pixel units (rows,colums)
         :param target_size:     source window shape as pixel units (rows,colums)
         """
-        binarySizes = [2 ** i for i in range(3, 14)]  # [8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192]
-        possibSizes_X = [i for i in binarySizes if i <= win_shape_YX[1]]
-        possibSizes_Y = [i for i in binarySizes if i <= win_shape_YX[0]]
-        if possibSizes_X and possibSizes_Y:
-            tgt_size_X, tgt_size_Y = target_size if target_size else (max(possibSizes_X), max(possibSizes_Y))
-            closest_to_target_X = int(min(possibSizes_X, key=lambda x: abs(x - tgt_size_X)))
-            closest_to_target_Y = int(min(possibSizes_Y, key=lambda y: abs(y - tgt_size_Y)))
-            return closest_to_target_Y, closest_to_target_X
-        else:
+        def get_closest_binary_size(max_size, tgt_size=None):
+            # largest power of 2 that fits into max_size (limited to 8192)
+            max_binSize = 1 << min(int(max_size).bit_length() - 1, 13)
+            if tgt_size is None or tgt_size >= max_binSize:
+                return max_binSize
+            if tgt_size <= 8:
+                return 8
+
+            # the closest power of 2 is either the one below or above tgt_size (ties resolve to the smaller one)
+            lower = 1 << (int(tgt_size).bit_length() - 1)
+            return lower * 2 if lower * 2 - tgt_size < tgt_size - lower else lower
+
+        if win_shape_YX[0] < 8 or win_shape_YX[1] < 8:
             return None
 
+        tgt_size_X, tgt_size_Y = target_size if target_size else (None, None)
+        return (get_closest_binary_size(win_shape_YX[0], tgt_size_Y),
+                get_closest_binary_size(win_shape_YX[1], tgt_size_X))
+
     def _calc_shifted_cross_power_spectrum(self,
                                            im0=None,
                                            im1=None,
@@ -1116,7 +1356,9 @@ class COREG(object):
 
         :param im0:         reference image
         :param im1:         subject image to shift
-        :param precision:   to be quantified as a datatype
+        :param precision:   complex data type used for the FFTs and the cross power spectrum
+                            (default: np.complex64, i.e., single precision; the input windows are converted to the
+                            corresponding real-valued data type as real-to-complex FFTs are used)
         :return:            2D-numpy-array of the shifted cross power spectrum
         """
         im0 = im0 if im0 is not None else self.matchWin[:] if self.matchWin.imID == 'ref' else self.otherWin[:]
@@ -1138,41 +1380,48 @@ class COREG(object):
                 # FIXME size of self.matchWin is not updated
                 # FIXME CoRegPoints_grid.WIN_SZ is taken from self.matchBox.imDimsYX but this is not updated
 
-            center_YX = np.array(im0.shape) / 2
-            xmin, xmax = int(center_YX[1] - wsYX[1] / 2), int(center_YX[1] + wsYX[1] / 2)
-            ymin, ymax = int(center_YX[0] - wsYX[0] / 2), int(center_YX[0] + wsYX[0] / 2)
+            # centered window bounds in pure integer arithmetic (same as int(center -/+ winsize / 2))
+            (rows, cols), (wsY, wsX) = im0.shape, wsYX
+            xmin, xmax = (cols - wsX) // 2, (cols + wsX) // 2
+            ymin, ymax = (rows - wsY) // 2, (rows + wsY) // 2
 
-            in_arr0 = im0[ymin:ymax, xmin:xmax].astype(precision)
-            in_arr1 = im1[ymin:ymax, xmin:xmax].astype(precision)
+            # NOTE: The windows are real-valued, so real-to-complex FFTs are used which only compute the
+            #       non-redundant half of the spectrum.
+            real_dtype = np.finfo(precision).dtype
+            win0, win1 = im0[ymin:ymax, xmin:xmax], im1[ymin:ymax, xmin:xmax]
 
             if self.v:
-                PLT.subplot_imshow([np.real(in_arr0).astype(np.float32), np.real(in_arr1).astype(np.float32)],
+                PLT.subplot_imshow([win0.astype(np.float32), win1.astype(np.float32)],
                                    ['FFTin ' + self.ref.title, 'FFTin ' + self.shift.title], grid=True)
 
             fft_arr0, fft_arr1 = None, None
+            fftw_threads = self.CPUs or os.cpu_count() or 1
             if pyfftw and self.fftw_works is not False:  # if module is installed and working
                 try:
-                    fft_arr0 = pyfftw.FFTW(in_arr0, np.empty_like(in_arr0), axes=(0, 1))()
-                    fft_arr1 = pyfftw.FFTW(in_arr1, np.empty_like(in_arr1), axes=(0, 1))()
-
-                    # catch empty output arrays (for some reason this happens sometimes..) -> use numpy fft
-                    # => this is caused by the call of pyfftw.FFTW. Exactly in that moment the input array
-                    #    in_arr0 is overwritten with zeros (maybe this is a bug in pyFFTW?)
+                    # the windows are directly copied into the aligned input buffer of the cached plan and transformed
+                    # in a single batch (the plan transforms the last two axes of the stacked buffer)
+                    # NOTE: The spectra are only needed within this method, so the output buffer is used without copy.
+                    fftw_plan = _get_fftw_plan((2,) + win0.shape, real_dtype, threads=fftw_threads)
+                    fft_arr0, fft_arr1 = _execute_fftw_plan(fftw_plan, win0, win1, copy_output=False)
+
+                    # catch empty output arrays -> use scipy.fft
+                    # NOTE: FFTW_MEASURE planning overwrites the input array, which is why the plans are created on
+                    #       separate aligned buffers by _get_fftw_plan()
                     if np.std(fft_arr0) == 0 or np.std(fft_arr1) == 0:
                         raise RuntimeError('FFTW result is unexpectedly empty.')
 
                     self.fftw_works = True
 
                 except RuntimeError:
-                    self.fftw_works = False
-
-                    # recreate input arrays and use numpy fft as fallback
-                    in_arr0 = im0[ymin:ymax, xmin:xmax].astype(precision)
-                    in_arr1 = im1[ymin:ymax, xmin:xmax].astype(precision)
+                    self.fftw_works = False  # use scipy.fft as fallback
 
             if self.fftw_works is False or fft_arr0 is None or fft_arr1 is None:
-                fft_arr0 = np.fft.fft2(in_arr0)
-                fft_arr1 = np.fft.fft2(in_arr1)
+                # write both windows into one stacked buffer of the target precision (avoids temporary copies) and
+                # transform them in a single multithreaded call (scipy.fft keeps single precision)
+                in_arr = np.empty((2,) + win0.shape, dtype=real_dtype)
+                np.copyto(in_arr[0], win0, casting='unsafe')
+                np.copyto(in_arr[1], win1, casting='unsafe')
+                fft_arr0, fft_arr1 = rfft2(in_arr, overwrite_x=True, workers=fftw_threads).astype(precision, copy=False)
 
             # GeoArray(fft_arr0.astype(np.float32)).show(figsize=(15,15))
             # GeoArray(fft_arr1.astype(np.float32)).show(figsize=(15,15))
@@ -1183,21 +1432,33 @@ class COREG(object):
             eps = np.abs(fft_arr1).max() * 1e-15
             # cps == cross-power spectrum of im0 and im2
 
-            temp = np.array(fft_arr0 * fft_arr1.conjugate()) / (np.abs(fft_arr0) * np.abs(fft_arr1) + eps)
+            # pyFFTW is installed and the forward transformation worked
+            # -> the cross-power spectrum is directly written into the input buffer of the cached inverse plan
+            ifftw_plan = _get_fftw_plan(win0.shape, real_dtype, 'FFTW_BACKWARD', threads=fftw_threads) \
+                if pyfftw and self.fftw_works else None
+
+            # normalize the cross-power spectrum in place using |F0 * conj(F1)| == |F0| * |F1|
+            # NOTE: fft_arr1 may be conjugated in place as only its real part is needed afterwards (for plotting)
+            temp = np.multiply(fft_arr0, np.conjugate(fft_arr1, out=fft_arr1),
+                               out=ifftw_plan.input_array if ifftw_plan else None)
+            denom = np.abs(temp)
+            denom += eps
+            temp /= denom
 
             time0 = time.time()
-            if 'pyfft' in globals():
-                ifft_arr = pyfftw.FFTW(temp, np.empty_like(temp), axes=(0, 1), direction='FFTW_BACKWARD')()
+            if ifftw_plan:
+                ifft_arr = _execute_fftw_plan(ifftw_plan)
             else:
-                ifft_arr = np.fft.ifft2(temp)
+                ifft_arr = irfft2(temp, s=win0.shape, overwrite_x=True, workers=fftw_threads)
             if self.v:
                 print('backward FFTW: %.2fs' % (time.time() - time0))
 
-            cps = np.abs(ifft_arr)
+            # the inverse real FFT already returns real values -> only take the absolute values (in place)
+            cps = np.abs(ifft_arr, out=ifft_arr)
             # scps = shifted cps  => shift the zero-frequency component to the center of the spectrum
-            scps = np.fft.fftshift(cps)
+            scps = _fftshift_inplace(cps)
             if self.v:
-                PLT.subplot_imshow([np.real(in_arr0).astype(np.uint16), np.real(in_arr1).astype(np.uint16),
+                PLT.subplot_imshow([win0.astype(np.uint16), win1.astype(np.uint16),
                                     np.real(fft_arr0).astype(np.uint8), np.real(fft_arr1).astype(np.uint8), scps],
                                    titles=['matching window im0', 'matching window im1',
                                            "fft result im0", "fft result im1", "cross power spectrum"], grid=True)
@@ -1211,17 +1472,16 @@ class COREG(object):
         return scps
 
     @staticmethod
-    def _get_peakpos(scps: np.ndarray) -> np.ndarray:
+    def _get_peakpos(scps: np.ndarray) -> (int, int):
         """Return the row/column position of the peak within the given cross power spectrum.
 
         :param scps: shifted cross power spectrum
-        :return:     [row, column]
+        :return:     (row, column)
         """
-        max_flat_idx = np.argmax(scps)
-        return np.array(np.unravel_index(max_flat_idx, scps.shape))
+        return divmod(int(np.argmax(scps)), scps.shape[1])
 
     @staticmethod
-    def _get_shifts_from_peakpos(peakpos: np.array,
+    def _get_shifts_from_peakpos(peakpos: tuple,
                                  arr_shape: tuple
                                  ) -> (float, float):
         y_shift = peakpos[0] - arr_shape[0] // 2
@@ -1230,26 +1490,20 @@ class COREG(object):
 
     @staticmethod
     def _clip_image(im, center_YX, winSzYX):  # TODO this is also implemented in GeoArray
+        (cY, cX), (wsY, wsX) = center_YX, winSzYX
+        xmin, xmax = int(cX - wsX / 2), int(cX + wsX / 2)
+        ymin, ymax = int(cY - wsY / 2), int(cY + wsY / 2)
 
-        def get_bounds(YX, wsY, wsX):
-            return int(YX[1] - (wsX / 2)),\
-                   int(YX[1] + (wsX / 2)),\
-                   int(YX[0] - (wsY / 2)),\
-                   int(YX[0] + (wsY / 2))
-
-        wsY, wsX = winSzYX
-        xmin, xmax, ymin, ymax = get_bounds(center_YX, wsY, wsX)
-
-        return im[ymin:ymax, xmin:xmax]
+        return im[ymin:ymax, xmin:xmax]  # view, no copy
 
     def _get_grossly_deshifted_images(self, im0, im1, x_intshift, y_intshift):
         # TODO this is also implemented in GeoArray # this should update ref.win.data and shift.win.data
         # FIXME avoid that matching window gets smaller although shifting it  with the previous win_size would not move
         #       it into nodata-area
         # get_grossly_deshifted_im0
-        old_center_YX = np.array(im0.shape) / 2
-        new_center_YX = [old_center_YX[0] + y_intshift,
-                         old_center_YX[1] + x_intshift]
+        old_center_YX = (im0.shape[0] / 2, im0.shape[1] / 2)
+        new_center_YX = (old_center_YX[0] + y_intshift,
+                         old_center_YX[1] + x_intshift)
 
         x_left = new_center_YX[1]
         x_right = im0.shape[1] - new_center_YX[1]
@@ -1264,7 +1518,7 @@ class COREG(object):
         gdsh_im0 = self._clip_image(im0, new_center_YX, [maxposs_winsz_y, maxposs_winsz_x])
 
         # get_corresponding_im1_clip
-        crsp_im1 = self._clip_image(im1, np.array(im1.shape) / 2, gdsh_im0.shape)
+        crsp_im1 = self._clip_image(im1, (im1.shape[0] / 2, im1.shape[1] / 2), gdsh_im0.shape)
 
         if self.v:
             PLT.subplot_imshow([self._clip_image(im0, old_center_YX, gdsh_im0.shape), crsp_im1],
@@ -1279,12 +1533,10 @@ class COREG(object):
     def _find_side_maximum(self, scps):
         # peakR, peakC = self._get_peakpos(scps)
         peakR, peakC = scps.shape[0] // 2, scps.shape[1] // 2
-        profileX = scps[peakR, :].flatten()  # row profile with values from left to right
-        profileY = scps[:, peakC].flatten()  # column profile with values from top to bottom
 
-        # get scps values of side maxima
-        sm_left, sm_right = profileX[peakC - 1], profileX[peakC + 1]
-        sm_above, sm_below = profileY[peakR - 1], profileY[peakR + 1]
+        # get scps values of side maxima (read directly as scalars instead of copying the whole row/column profiles)
+        sm_left, sm_right = float(scps[peakR, peakC - 1]), float(scps[peakR, peakC + 1])
+        sm_above, sm_below = float(scps[peakR - 1, peakC]), float(scps[peakR + 1, peakC])
 
         sidemax_lr = {'value': max([sm_left, sm_right]),
                       'side': 'left' if sm_left > sm_right else 'right',
@@ -1296,6 +1548,8 @@ class COREG(object):
         if self.v:
             print('Horizontal side maximum found %s. value: %s' % (sidemax_lr['side'], sidemax_lr['value']))
             print('Vertical side maximum found %s. value: %s' % (sidemax_ab['side'], sidemax_ab['value']))
+            profileX = scps[peakR, :]  # row profile with values from left to right
+            profileY = scps[:, peakC]  # column profile with values from top to bottom
             PLT.subplot_2dline([[range(profileX.size), profileX], [range(profileY.size), profileY]],
                                titles=['X-Profile', 'Y-Profile'], shapetuple=(1, 2), grid=True)
 
@@ -1307,25 +1561,30 @@ class COREG(object):
 
         return x_intshift, y_intshift
 
-    def _calc_shift_reliability(self, scps: np.ndarray):
+    def _calc_shift_reliability(self, scps: np.ndarray, peakpos: Tuple[int, int] = None):
         """Calculate a confidence percentage to be used as an assessment for reliability of the calculated shifts.
 
         :param scps:    shifted cross power spectrum
+        :param peakpos: row/column position of the peak within scps (computed if not given)
         :return:
         """
         # calculate mean power at peak
-        peakR, peakC = self._get_peakpos(scps)
-        power_at_peak = np.mean(scps[peakR - 1:peakR + 2, peakC - 1:peakC + 2])
-
-        # calculate mean power without peak + 3* standard deviation
-        scps_masked = scps
-        scps_masked[peakR - 1:peakR + 2, peakC - 1:peakC + 2] = -9999
-        scps_masked = np.ma.masked_equal(scps_masked, -9999)
-        power_without_peak = np.mean(scps_masked) + 2 * np.std(scps_masked)
+        peakR, peakC = peakpos or self._get_peakpos(scps)
+        scps_peak = scps[peakR - 1:peakR + 2, peakC - 1:peakC + 2]
+        power_at_peak = np.mean(scps_peak)
+
+        # calculate mean power without peak + 2* standard deviation
+        # NOTE: Mean and standard deviation are derived from the sums (of squares) over the whole array minus those
+        #       over the peak area. This avoids masking (and thus modifying or copying) the cross power spectrum.
+        scps_flat, peak_flat = scps.ravel(), scps_peak.ravel()
+        count_wo_peak = scps_flat.size - peak_flat.size
+        mean_wo_peak = (np.sum(scps_flat, dtype=np.float64) - np.sum(peak_flat, dtype=np.float64)) / count_wo_peak
+        sqmean_wo_peak = (float(np.dot(scps_flat, scps_flat)) - float(np.dot(peak_flat, peak_flat))) / count_wo_peak
+        power_without_peak = mean_wo_peak + 2 * np.sqrt(max(sqmean_wo_peak - mean_wo_peak ** 2, 0))
 
         # calculate confidence
         confid = 100 - ((power_without_peak / power_at_peak) * 100)
-        confid = 100 if confid > 100 else 0 if confid < 0 else confid
+        confid = np.clip(confid, 0, 100)
 
         if not self.q:
             print('Estimated reliability of the calculated shifts:  %.1f' % confid, '%')
@@ -1358,10 +1617,11 @@ class COREG(object):
         else:
             return 'valid', 0, 0, None
 
-    def _calc_subpixel_shifts(self, scps: np.ndarray):
+    def _calc_subpixel_shifts(self, scps: np.ndarray, peakpos: Tuple[int, int] = None):
         sidemax_lr, sidemax_ab = self._find_side_maximum(scps)
-        x_subshift = (sidemax_lr['direction_factor'] * sidemax_lr['value']) / (np.max(scps) + sidemax_lr['value'])
-        y_subshift = (sidemax_ab['direction_factor'] * sidemax_ab['value']) / (np.max(scps) + sidemax_ab['value'])
+        peak_value = scps[peakpos] if peakpos else np.max(scps)  # avoid a full pass over scps if the peak is known
+        x_subshift = (sidemax_lr['direction_factor'] * sidemax_lr['value']) / (peak_value + sidemax_lr['value'])
+        y_subshift = (sidemax_ab['direction_factor'] * sidemax_ab['value']) / (peak_value + sidemax_ab['value'])
 
         return x_subshift, y_subshift
 
@@ -1384,6 +1644,12 @@ class COREG(object):
 
         :returns:   GeoArray instance of de-shifted self.otherWin
         """
+        # return the cached result if shifts and matching window did not change since the last call
+        # (e.g., show_matchWin() after calculate_spatial_shifts() would otherwise run DESHIFTER again)
+        cache_key = (self.x_shift_px, self.y_shift_px, self.otherWin.imID, tuple(self.matchBox.mapPoly.bounds))
+        if self._deshifted_otherWin is not None and self._deshifted_otherWin[0] == cache_key:
+            return self._deshifted_otherWin[1]
+
         # shift vectors have been calculated to fit target image onto reference image
         # -> so the shift vectors have to be inverted if shifts are applied to reference image
         coreg_info = self._get_inverted_coreg_info() if self.otherWin.imID == 'ref' else self.coreg_info
@@ -1397,6 +1663,8 @@ class COREG(object):
                                target_xyGrid=matchFull.xygrid_specs,
                                q=True
                                ).correct_shifts()
+        self._deshifted_otherWin = (cache_key, ds_results['GeoArray_shifted'])
+
         return ds_results['GeoArray_shifted']
 
     def _validate_ssim_improvement(self,
@@ -1422,14 +1690,22 @@ class COREG(object):
             if maxval == minval:
                 maxval += 1e-5
 
-            return ((array - minval) / (maxval - minval)).astype(np.float64)
+            # rescale in place within a single float64 copy instead of creating multiple temporary arrays
+            array = array.astype(np.float64)
+            array -= minval
+            array /= maxval - minval
+
+            return array
 
         # compute SSIM BEFORE shift correction #
         ########################################
 
+        # get the matchWin data only once (also used for the SSIM after shift correction)
+        matchWinData = self.matchWin[:]
+
         # using gaussian weights could lead to value errors in case of small images when the automatically calculated
         # window size exceeds the image size
-        self.ssim_orig = ssim(normalize(np.ma.masked_equal(self.matchWin[:],
+        self.ssim_orig = ssim(normalize(np.ma.masked_equal(matchWinData,
                                                            self.matchWin.nodata)),
                               normalize(np.ma.masked_equal(self.otherWin[:],
                                                            self.otherWin.nodata)),
@@ -1441,9 +1717,6 @@ class COREG(object):
         # resample otherWin while correcting detected shifts and match geographic bounds of matchWin
         otherWin_deshift_geoArr = self._get_deshifted_otherWin()
 
-        # get the corresponding matchWin data
-        matchWinData = self.matchWin[:]
-
         # check if shapes of two images are unequal (due to bug (?), in some cases otherWin_deshift_geoArr does not have
         # the exact same dimensions as self.matchWin -> maybe bounds are handled differently by gdal.Warp)
         if not self.matchWin.shape == otherWin_deshift_geoArr.shape:  # FIXME this seems to be already fixed
@@ -1505,13 +1778,42 @@ class COREG(object):
 
         return self.ssim_orig, self.ssim_deshifted
 
+    def _validate_ssim_improvement_if_pending(self) -> None:
+        """Run the SSIM computation deferred by calculate_spatial_shifts() in quiet mode (if not done yet)."""
+        if self._ssim_pending:
+            self._ssim_pending = False
+            self._validate_ssim_improvement()
+
+    @property
+    def ssim_orig(self) -> Optional[float]:
+        """Return the mean structural similarity index within the matching window BEFORE co-registration."""
+        self._validate_ssim_improvement_if_pending()
+        return self._ssim_orig
+
+    @ssim_orig.setter
+    def ssim_orig(self, ssim_val: Optional[float]):
+        self._ssim_orig = ssim_val
+
+    @property
+    def ssim_deshifted(self) -> Optional[float]:
+        """Return the mean structural similarity index within the matching window AFTER co-registration."""
+        self._validate_ssim_improvement_if_pending()
+        return self._ssim_deshifted
+
+    @ssim_deshifted.setter
+    def ssim_deshifted(self, ssim_val: Optional[float]):
+        self._ssim_deshifted = ssim_val
+
     @property
     def ssim_improved(self) -> bool:
         """Return True if image similarity within the matching window has been improved by co-registration."""
         if self.success is True:
             if self._ssim_improved is None:
-                ssim_orig, ssim_deshifted = self._validate_ssim_improvement()
-                self._ssim_improved = ssim_orig <= ssim_deshifted
+                # only compute the SSIM values if they are not already available (_validate_ssim_improvement() does
+                # not set self._ssim_improved in case the SSIM input array shapes could not be equalized)
+                if self.ssim_orig is None or self.ssim_deshifted is None:
+                    self._validate_ssim_improvement()
+                self._ssim_improved = self.ssim_orig <= self.ssim_deshifted
 
             return self._ssim_improved
 
@@ -1564,6 +1866,7 @@ class COREG(object):
         else:
             valid_invalid, x_val_shift, y_val_shift, scps = \
                 self._validate_integer_shifts(im0, im1, x_intshift, y_intshift)
+            validated_shifts = {(x_intshift, y_intshift)}
 
             while valid_invalid != 'valid':
                 count_iter += 1
@@ -1577,6 +1880,13 @@ class COREG(object):
                     self.success = False
                     break
 
+                if (x_val_shift, y_val_shift) in validated_shifts:
+                    # the validation is deterministic -> the same shifts would be validated again and again until
+                    # max_iter is reached
+                    self._handle_error(RuntimeError('No match found in the given window.'))
+                    break
+                validated_shifts.add((x_val_shift, y_val_shift))
+
                 if not self.q:
                     print('No clear match found yet. Jumping to iteration %s...' % count_iter)
                     print('input shifts: ', x_val_shift, y_val_shift)
@@ -1590,9 +1900,13 @@ class COREG(object):
                     x_intshift, y_intshift = x_val_shift, y_val_shift
 
         # calculate sub-pixel shifts
+        peakpos = None
         if self.success or self.success is None:
+            # the integer shifts are validated at this point, i.e., the peak of scps is located at its center
+            peakpos = (scps.shape[0] // 2, scps.shape[1] // 2)
+
             # get total pixel shifts
-            x_subshift, y_subshift = self._calc_subpixel_shifts(scps)
+            x_subshift, y_subshift = self._calc_subpixel_shifts(scps, peakpos)
             x_totalshift, y_totalshift = self._get_total_shifts(x_intshift, y_intshift, x_subshift, y_subshift)
 
             if max([abs(x_totalshift), abs(y_totalshift)]) > self.max_shift:
@@ -1612,7 +1926,7 @@ class COREG(object):
                 self.x_shift_map, self.y_shift_map = new_originX - self.shift.gt[0], new_originY - self.shift.gt[3]
 
                 # get length of shift vector in map units
-                self.vec_length_map = float(np.sqrt(self.x_shift_map ** 2 + self.y_shift_map ** 2))
+                self.vec_length_map = math.hypot(self.x_shift_map, self.y_shift_map)
 
                 # get angle of shift vector
                 self.vec_angle_deg = GEO.angle_to_north((self.x_shift_px, self.y_shift_px)).tolist()[0]
@@ -1634,14 +1948,19 @@ class COREG(object):
         if self.x_shift_px or self.y_shift_px:
             self._get_updated_map_info()
 
-            # set self.ssim_before and ssim_after
-            self._validate_ssim_improvement()  # FIXME uses the not updated matchWin size
-            self.shift_reliability = self._calc_shift_reliability(scps)
+            # set self.ssim_orig and self.ssim_deshifted
+            # NOTE: In quiet mode, nothing is printed, so the SSIM computation (incl. resampling of the other window)
+            #       is deferred until one of the SSIM attributes is accessed.
+            if self.q and not self.v:
+                self._ssim_pending = True
+            else:
+                self._validate_ssim_improvement()  # FIXME uses the not updated matchWin size
+            self.shift_reliability = self._calc_shift_reliability(scps, peakpos)
 
         return 'success'
 
     def _get_updated_map_info(self) -> None:
-        original_map_info = geotransform2mapinfo(self.shift.gt, self.shift.prj)
+        original_map_info = _get_mapinfo(self.shift.gt, self.shift.prj)
         self.updated_map_info = copy(original_map_info)
         self.updated_map_info[3] = str(float(original_map_info[3]) + self.x_shift_map)
         self.updated_map_info[4] = str(float(original_map_info[4]) + self.y_shift_map)
@@ -1670,7 +1989,7 @@ class COREG(object):
                     'y': self.y_shift_map
                 },
                 'original map info':
-                    geotransform2mapinfo(self.shift.gt, self.shift.prj),
+                    _get_mapinfo(self.shift.gt, self.shift.prj),
                 'updated map info':
                     self.updated_map_info,
                 'reference projection':
@@ -1695,12 +2014,12 @@ class COREG(object):
 
         This dictionary can be passed to DESHIFTER in order to fit the REFERENCE image onto the TARGET image.
         """
+        # NOTE: The nested shift dictionaries are rebuilt instead of inverted in place because the shallow copy of
+        #       coreg_info shares them with self.coreg_info.
         inv_coreg_info = copy(self.coreg_info)
-        inv_coreg_info['corrected_shifts_px']['x'] *= -1
-        inv_coreg_info['corrected_shifts_px']['y'] *= -1
-        inv_coreg_info['corrected_shifts_map']['x'] *= -1
-        inv_coreg_info['corrected_shifts_map']['y'] *= -1
-        inv_coreg_info['original map info'] = geotransform2mapinfo(self.ref.gt, self.ref.prj)
+        inv_coreg_info['corrected_shifts_px'] = {k: -v for k, v in inv_coreg_info['corrected_shifts_px'].items()}
+        inv_coreg_info['corrected_shifts_map'] = {k: -v for k, v in inv_coreg_info['corrected_shifts_map'].items()}
+        inv_coreg_info['original map info'] = _get_mapinfo(self.ref.gt, self.ref.prj)
         inv_coreg_info['reference geotransform'] = self.shift.gt
         inv_coreg_info['reference grid'] = self.shift.xygrid_specs
         inv_coreg_info['reference projection'] = self.shift.prj
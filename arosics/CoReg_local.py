@@ -26,7 +26,7 @@
 import warnings
 import os
 from copy import copy
-from typing import Tuple, Union, Optional
+from typing import Tuple, Union, Optional, TYPE_CHECKING
 from collections import OrderedDict
 
 # custom
@@ -41,7 +41,6 @@ except ImportError:
     pyfftw = None
 import numpy as np
 
-from matplotlib import pyplot as plt  # noqa F401
 from geopandas import GeoDataFrame  # noqa F401
 
 from .Tie_Point_Grid import Tie_Point_Grid
@@ -52,6 +51,9 @@ from py_tools_ds.geo.coord_trafo import transform_any_prj, reproject_shapelyGeom
 from py_tools_ds.geo.map_info import geotransform2mapinfo
 from geoarray import GeoArray
 
+if TYPE_CHECKING:
+    from matplotlib import pyplot as plt  # noqa F401  # only imported on demand to speed up the package import
+
 __author__ = 'Daniel Scheffler'
 
 
@@ -503,7 +505,7 @@ class COREG_LOCAL(object):
     def view_CoRegPoints(self,
                          shapes2plot: str = 'points',
                          attribute2plot: str = 'ABS_SHIFT',
-                         cmap: plt.cm = None,
+                         cmap: 'plt.cm' = None,
                          exclude_fillVals: bool = True,
                          backgroundIm: str = 'tgt',
                          hide_filtered: bool = True,
@@ -27,7 +27,7 @@ import collections
 import multiprocessing
 import os
 import warnings
-from time import time, sleep
+from time import time
 from typing import Optional, Union
 
 # custom
@@ -36,11 +36,9 @@ import numpy as np
 from geopandas import GeoDataFrame
 from pandas import DataFrame, Series
 from shapely.geometry import Point
-from matplotlib import pyplot as plt
-from scipy.interpolate import RBFInterpolator, RegularGridInterpolator
 
 # internal modules
-from .CoReg import COREG
+from .CoReg import COREG, _get_plotly_offline
 from py_tools_ds.geo.projection import isLocal
 from py_tools_ds.io.pathgen import get_generic_outpath
 from py_tools_ds.processing.progress_mon import ProgressBar
@@ -300,6 +298,10 @@ class Tie_Point_Grid(object):
         CR.fftw_works = fftw_works
         CR.calculate_spatial_shifts()
 
+        # run the SSIM computation deferred in quiet mode before fetching the results as it may still shrink the
+        # matching window (or track an error), which would otherwise not be reflected by the window size below
+        CR._validate_ssim_improvement_if_pending()
+
         # fetch results
         last_err = CR.tracked_errors[-1] if CR.tracked_errors else None
         win_sz_y, win_sz_x = CR.matchBox.imDimsYX if CR.matchBox else (None, None)
@@ -309,11 +311,10 @@ class Tie_Point_Grid(object):
 
         return [pointID] + CR_res
 
-    def _get_coreg_kwargs(self, pID, wp):
+    def _get_common_coreg_kwargs(self) -> dict:
+        """Return the COREG keyword arguments that are the same for all tie points (computed once per grid)."""
         return dict(
-            pointID=pID,
             fftw_works=self.COREG_obj.fftw_works,
-            wp=wp,
             ws=self.COREG_obj.win_size_XY,
             resamp_alg_calc=self.rspAlg_calc,
             footprint_poly_ref=self.COREG_obj.ref.poly,
@@ -330,6 +331,10 @@ class Tie_Point_Grid(object):
             ignore_errors=True
         )
 
+    @staticmethod
+    def _get_coreg_kwargs(pID, wp, common_kwargs: dict) -> dict:
+        return dict(common_kwargs, pointID=pID, wp=wp)
+
     def get_CoRegPoints_table(self):
         assert self.XY_points is not None and self.XY_mapPoints is not None
 
@@ -377,33 +382,28 @@ class Tie_Point_Grid(object):
         self.shift.cache_array_subset([self.COREG_obj.shift.band4match])
 
         # get all variations of kwargs for coregistration
-        list_coreg_kwargs = (self._get_coreg_kwargs(i, self.XY_mapPoints[i]) for i in GDF.index)  # generator
+        common_coreg_kwargs = self._get_common_coreg_kwargs()
+        list_coreg_kwargs = (self._get_coreg_kwargs(i, self.XY_mapPoints[i], common_coreg_kwargs)
+                             for i in GDF.index)  # generator
 
         # run co-registration for whole grid
         if self.CPUs is None or self.CPUs > 1:
+            cpus = self.CPUs if self.CPUs is not None else multiprocessing.cpu_count()
             if not self.q:
-                cpus = self.CPUs if self.CPUs is not None else multiprocessing.cpu_count()
                 print("Calculating tie point grid (%s points) using %s CPU cores..." % (len(GDF), cpus))
 
             with multiprocessing.Pool(self.CPUs, initializer=mp_initializer, initargs=(self.ref, self.shift)) as pool:
                 if self.q or not self.progress:
                     results = pool.map(self._get_spatial_shifts, list_coreg_kwargs)
                 else:
-                    results = pool.map_async(self._get_spatial_shifts, list_coreg_kwargs, chunksize=1)
+                    # imap returns the results in order as soon as they are ready
+                    # -> no polling needed and multiple tie points can be sent to a worker at once
+                    chunksize = max(1, len(GDF) // (cpus * 16))
                     bar = ProgressBar(prefix='\tprogress:')
-                    while True:
-                        sleep(.1)
-                        # this does not really represent the remaining tasks but the remaining chunks
-                        # -> thus chunksize=1
-                        # noinspection PyProtectedMember
-                        numberDone = len(GDF) - results._number_left
-                        if self.progress:
-                            bar.print_progress(percent=numberDone / len(GDF) * 100)
-                        if results.ready():
-                            # <= this is the line where multiprocessing can freeze if an exception appears within
-                            # COREG and is not raised
-                            results = results.get()
-                            break
+                    results = []
+                    for res in pool.imap(self._get_spatial_shifts, list_coreg_kwargs, chunksize=chunksize):
+                        results.append(res)
+                        bar.print_progress(percent=len(results) / len(GDF) * 100)
                 pool.close()  # needed to make coverage work in multiprocessing
                 pool.join()
 
@@ -690,12 +690,9 @@ class Tie_Point_Grid(object):
         figsize = figsize if figsize else (10, 10)
 
         if interactive:
-            from plotly.offline import iplot, init_notebook_mode
-            import plotly.graph_objs as go
+            iplot, go = _get_plotly_offline()
             # FIXME outliers are not plotted
 
-            init_notebook_mode(connected=True)
-
             # Create a trace
             trace = go.Scatter(
                 x=tbl_il[x_attr],
@@ -1341,6 +1338,8 @@ class Tie_Point_Grid_Interpolator(object):
                                    metric: str
                                    ):
         """Plot the interpolation result together with the input point data."""
+        from matplotlib import pyplot as plt
+
         plt.figure(figsize=(7, 7))
         im = plt.imshow(data_full)
         plt.colorbar(im)
@@ -1356,6 +1355,8 @@ class Tie_Point_Grid_Interpolator(object):
                                  cols_full: np.ndarray
                                  ):
         """Run linear regular grid interpolation."""
+        from scipy.interpolate import RegularGridInterpolator  # import here to speed up 'import arosics'
+
         RGI = RegularGridInterpolator(points=[cols, rows],
                                       values=data.T,  # must be in shape [x, y]
                                       method='linear',
@@ -1375,6 +1376,8 @@ class Tie_Point_Grid_Interpolator(object):
         -> https://github.com/agile-geoscience/xlines/blob/master/notebooks/11_Gridding_map_data.ipynb
         -> documents the legacy scipy.interpolate.Rbf
         """
+        from scipy.interpolate import RBFInterpolator  # import here to speed up 'import arosics'
+
         rbf = RBFInterpolator(
             np.column_stack([cols, rows]), data,
             kernel="linear",
@@ -64,6 +64,20 @@ class COREG_GLOBAL_init(unittest.TestCase):
         # get instance of COREG_LOCAL object
         self.CRL = COREG(self.ref_gA, self.tgt_gA, **self.coreg_kwargs)
 
+    def test_coreg_init_with_flat_data_corners(self):
+        # pass the data corners as [x,y,x,y,..] instead of [[x,y],[x,y],..]
+        corners_ref = [340870, 5862000, 354000, 5862000, 354000, 5830000, 331320, 5830000]
+        corners_tgt = [341890, 5866490, 356180, 5866490, 356180, 5834970, 335440, 5834970]
+        CR = COREG(self.ref_path, self.tgt_path,
+                   **dict(self.coreg_kwargs,
+                          footprint_poly_ref=None,
+                          footprint_poly_tgt=None,
+                          data_corners_ref=corners_ref,
+                          data_corners_tgt=corners_tgt))
+
+        self.assertEqual(CR.params['data_corners_ref'][1], [354000, 5862000])
+        self.assertEqual(CR.ref.footprint_poly.bounds, (331320, 5830000, 354000, 5862000))
+
     def test_empty_image(self):
         # get GeoArray instances
         self.ref_gA = GeoArray(self.ref_path)
@@ -393,6 +407,93 @@ class CompleteWorkflow_INTER1_S2A_S2A(unittest.TestCase):
         self.run_shift_detection_correction(self.ref_path, self.tgt_path, **kw)
         self.assertTrue('COMPRESSION=DEFLATE' in gdal.Info(kw['path_out']))
 
+    def test_get_inverted_coreg_info(self):
+        """Test if inverting coreg_info leaves the original coreg_info untouched."""
+        CR = COREG(self.ref_path, self.tgt_path, **self.coreg_kwargs)
+        CR.calculate_spatial_shifts()
+        shifts_px = dict(CR.coreg_info['corrected_shifts_px'])
+        shifts_map = dict(CR.coreg_info['corrected_shifts_map'])
+
+        inv_coreg_info = CR._get_inverted_coreg_info()
+        self.assertEqual(inv_coreg_info['corrected_shifts_px'], {k: -v for k, v in shifts_px.items()})
+        self.assertEqual(inv_coreg_info['corrected_shifts_map'], {k: -v for k, v in shifts_map.items()})
+        self.assertEqual(CR.coreg_info['corrected_shifts_px'], shifts_px)
+        self.assertEqual(CR.coreg_info['corrected_shifts_map'], shifts_map)
+
+    def test_deferred_ssim_computation(self):
+        """Test if the SSIM computation deferred in quiet mode yields the same values as the immediate computation."""
+        CR_immediate = COREG(self.ref_path, self.tgt_path, **self.coreg_kwargs)
+        CR_immediate.calculate_spatial_shifts()
+        self.assertFalse(CR_immediate._ssim_pending)
+
+        CR = COREG(self.ref_path, self.tgt_path, **dict(self.coreg_kwargs, q=True))
+        CR.calculate_spatial_shifts()
+        self.assertTrue(CR._ssim_pending)
+        self.assertIsNone(CR._ssim_orig)
+        self.assertIsNone(CR._ssim_deshifted)
+
+        # accessing the SSIM values triggers the computation
+        self.assertEqual(CR.ssim_orig, CR_immediate.ssim_orig)
+        self.assertFalse(CR._ssim_pending)
+        self.assertEqual(CR.ssim_deshifted, CR_immediate.ssim_deshifted)
+        self.assertEqual(CR.ssim_improved, CR_immediate.ssim_improved)
+
+
+class Test_FFT_helpers(unittest.TestCase):
+    """Test case for the helper functions of the phase correlation."""
+
+    def test_fftshift_inplace(self):
+        from arosics.CoReg import _fftshift_inplace
+
+        for shape in [(8, 8), (6, 10), (7, 7), (5, 8)]:
+            arr = np.random.RandomState(0).rand(*shape)
+            self.assertTrue(np.array_equal(_fftshift_inplace(arr.copy()), np.fft.fftshift(arr)))
+
+    def test_shrink_winsize_to_binarySize(self):
+        shrink = COREG._shrink_winsize_to_binarySize
+
+        self.assertEqual(shrink((256, 256)), (256, 256))
+        self.assertEqual(shrink((300, 1000)), (256, 512))
+        self.assertEqual(shrink((20000, 8)), (8192, 8))
+        self.assertIsNone(shrink((7, 512)))
+        self.assertEqual(shrink((1000, 1000), target_size=(100, 200)), (256, 128))
+        self.assertEqual(shrink((1000, 1000), target_size=(12, 4)), (8, 8))
+
+    def test_get_fftw_plan(self):
+        from arosics import CoReg as CoReg_module
+        if not CoReg_module.pyfftw:
+            self.skipTest('pyFFTW is not available.')
+
+        plan = CoReg_module._get_fftw_plan((8, 8))
+        self.assertIs(CoReg_module._get_fftw_plan((8, 8)), plan)
+
+        # the cache only keeps the most recently used plans
+        for i in range(CoReg_module._fftw_plans_maxsize):
+            CoReg_module._get_fftw_plan((8, 10 + 2 * i))
+        self.assertEqual(len(CoReg_module._fftw_plans.plans), CoReg_module._fftw_plans_maxsize)
+        self.assertIsNot(CoReg_module._get_fftw_plan((8, 8)), plan)
+
+
+class Test_show_helpers(unittest.TestCase):
+    """Test case for the helper functions of the matching window preview."""
+
+    def test_rescale_to_int8(self):
+        from skimage.exposure import rescale_intensity
+        from arosics.CoReg import _rescale_to_int8
+
+        rng = np.random.RandomState(0)
+        for arr in [rng.randint(0, 10000, (50, 60)).astype(np.int16),  # non-negative -> [0, 127]
+                    rng.randint(-5000, 5000, (50, 60)).astype(np.int16)]:  # signed -> [-128, 127]
+            vmin, vmax = np.percentile(arr, [2, 98])
+            res = _rescale_to_int8(arr, vmin, vmax)
+            self.assertEqual(res.dtype, np.int8)
+            self.assertTrue(np.array_equal(res, rescale_intensity(arr, in_range=(vmin, vmax), out_range='int8')))
+
+        # constant value range
+        arr = np.full((5, 5), 300, dtype=np.int16)
+        self.assertTrue(np.array_equal(_rescale_to_int8(arr, 300, 300),
+                                       rescale_intensity(arr, in_range=(300, 300), out_range='int8')))
+
 
 if __name__ == '__main__':
     import pytest